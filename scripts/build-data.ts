@@ -1,3 +1,5 @@
+import { createHash } from 'node:crypto';
+import { createReadStream } from 'node:fs';
 import fs from 'node:fs/promises';
 import path from 'node:path';
 import Papa from 'papaparse';
@@ -10,6 +12,9 @@ const DATA_DIR = path.join(ROOT, 'public', 'data');
 const AUDIO_DIR = path.join(ROOT, 'audio');
 const TOLS = [5, 15, 30] as const;
 
+// localeCompare with options builds a fresh collator per call; share one for natural ordering.
+const naturalCollator = new Intl.Collator(undefined, { numeric: true });
+
 const reqCols = ['bar_id', 'instrument_id', 'edo', 'step', 'step_name', 'cents_from_step0', 'ratio_to_step0', 'freq_if_step0_is_C'] as const;
 
 type ScaleId = string;
@@ -27,6 +32,7 @@ type Bar = {
   ratioSupported: boolean;
   hz: number;
   audioPath: string;
+  audioSha256: string | null;
 };
 
 const BarSchema = z.object({
@@ -43,8 +49,27 @@ const BarSchema = z.object({
   ratioSupported: z.boolean(),
   hz: z.number(),
   audioPath: z.string(),
+  audioSha256: z.string().nullable(),
 });
 
+async function writeJson(fileName: string, value: unknown, opts: { compact?: boolean } = {}): Promise<void> {
+  const filePath = path.join(DATA_DIR, fileName);
+  const text = `${opts.compact ? JSON.stringify(value) : JSON.stringify(value, null, 2)}\n`;
+  // Leave unchanged outputs untouched so their mtimes don't invalidate downstream caches.
+  const existing = await fs.readFile(filePath, 'utf8').catch(() => null);
+  if (existing === text) return;
+  await fs.writeFile(filePath, text);
+}
+
+async function sha256File(filePath: string): Promise<string> {
+  const hash = createHash('sha256');
+  for await (const chunk of createReadStream(filePath)) hash.update(chunk);
+  return hash.digest('hex');
+}
+
+// Derived floats are published at the manifest's own precision (six decimals); more digits only add bytes.
+const round6 = (x: number) => Math.round(x * 1e6) / 1e6;
+
 const centsDiff = (a: number, b: number) => 1200 * Math.log2(a / b);
 
 function normalizeFracString(frac: string): string {
@@ -71,8 +96,7 @@ const scaleIdFromFilename = (fileName: string): string => {
   return base;
 };
 
-const deriveScaleId = (edoRaw: string, fileName: string): ScaleId => {
-  const edo = normalizeScaleId(edoRaw);
+const deriveScaleId = (edo: string, fileName: string): ScaleId => {
   if (edo === 'harmonic') return 'harmonic';
   const asNum = Number(edo);
   if (Number.isFinite(asNum)) return `${asNum}edo`;
@@ -80,6 +104,12 @@ const deriveScaleId = (edoRaw: string, fileName: string): ScaleId => {
   return scaleIdFromFilename(fileName);
 };
 
+const deriveEdo = (edoRaw: string, normalizedEdo: string, scaleId: ScaleId): number | 'harmonic' => {
+  const edo = normalizedEdo === 'harmonic' ? Number.NaN : Number(edoRaw);
+  if (!Number.isNaN(edo)) return edo;
+  return scaleId === 'harmonic' ? 'harmonic' : Number(scaleId.replace(/edo$/, ''));
+};
+
 async function listAudioFileMap(scaleId: string) {
   const dir = path.join(AUDIO_DIR, scaleId);
   const byName = new Map<string, string>();
@@ -87,7 +117,11 @@ async function listAudioFileMap(scaleId: string) {
   try {
     const ents = await fs.readdir(dir, { withFileTypes: true });
     for (const ent of ents) {
-      if (!ent.isFile() || !ent.name.toLowerCase().endsWith('.wav')) continue;
+      if (!ent.name.toLowerCase().endsWith('.wav')) continue;
+      // A dirent describes the link itself; follow symlinks so broken links and links to directories count as missing.
+      const isFile = ent.isFile()
+        || (ent.isSymbolicLink() && (await fs.stat(path.join(dir, ent.name)).then((st) => st.isFile(), () => false)));
+      if (!isFile) continue;
       byName.set(ent.name, ent.name);
       byLower.set(ent.name.toLowerCase(), ent.name);
     }
@@ -98,20 +132,29 @@ async function listAudioFileMap(scaleId: string) {
 }
 
 function splitByRep(rows: Bar[], tol: number): Bar[][] {
+  // |centsDiff(a, b)| <= tol  <=>  lo <= a / b <= hi, so compare ratios instead of taking a log per pair.
+  const hi = 2 ** (tol / 1200);
+  const lo = 1 / hi;
+  const within = (a: number, b: number) => {
+    const r = a / b;
+    return r >= lo && r <= hi;
+  };
   const out: Bar[][] = [];
   let i = 0;
   while (i < rows.length) {
     const seed = rows[i];
     const tmp = [seed];
     i++;
-    while (i < rows.length && Math.abs(centsDiff(rows[i].hz, seed.hz)) <= tol) {
+    while (i < rows.length && within(rows[i].hz, seed.hz)) {
       tmp.push(rows[i]);
       i++;
     }
-    const repBarId = [...tmp].map((x) => x.barId).sort((a, b) => a.localeCompare(b))[0];
-    const rep = tmp.find((x) => x.barId === repBarId)!;
-    const good = tmp.filter((x) => Math.abs(centsDiff(x.hz, rep.hz)) <= tol);
-    const bad = tmp.filter((x) => !good.includes(x));
+    // The representative is the lexicographically smallest id.
+    let rep = seed;
+    for (const x of tmp) if (x.barId.localeCompare(rep.barId) < 0) rep = x;
+    const good: Bar[] = [];
+    const bad: Bar[] = [];
+    for (const x of tmp) (within(x.hz, rep.hz) ? good : bad).push(x);
     out.push(good);
     if (bad.length) {
       const rest = splitByRep(bad, tol);
@@ -122,15 +165,19 @@ function splitByRep(rows: Bar[], tol: number): Bar[][] {
 }
 
 async function main() {
-  await fs.mkdir(DATA_DIR, { recursive: true });
-  const files = (await fs.readdir(MANIFEST_DIR)).filter((f) => f.endsWith('.csv')).sort((a, b) => a.localeCompare(b));
-
-  const bars: Bar[] = [];
-  const missingAudio: string[] = [];
-  const audioIndexByScale = new Map<string, Awaited<ReturnType<typeof listAudioFileMap>>>();
-
-  for (const file of files) {
-    const text = await fs.readFile(path.join(MANIFEST_DIR, file), 'utf8');
+  const [, manifestEntries, repoVersion] = await Promise.all([
+    fs.mkdir(DATA_DIR, { recursive: true }),
+    fs.readdir(MANIFEST_DIR),
+    fs.readFile(path.join(ROOT, '.git', 'HEAD'), 'utf8').then((head) => head.trim() || undefined, () => undefined),
+  ]);
+  const files = manifestEntries.filter((f) => f.endsWith('.csv')).sort((a, b) => a.localeCompare(b));
+
+  const manifests = await Promise.all(
+    files.map(async (file) => ({ file, text: await fs.readFile(path.join(MANIFEST_DIR, file), 'utf8') })),
+  );
+
+  const rows: Array<{ row: Record<string, string>; scaleId: ScaleId; edo: number | 'harmonic' }> = [];
+  for (const { file, text } of manifests) {
     const parsed = Papa.parse<Record<string, string>>(text, { header: true, skipEmptyLines: true });
     if (parsed.errors.length) throw new Error(`${file}: ${parsed.errors[0].message}`);
     const headers = parsed.meta.fields ?? [];
@@ -140,43 +187,51 @@ async function main() {
       for (const col of reqCols) {
         if (!(row[col] ?? '').toString().trim()) throw new Error(`${file}:${row.bar_id}: missing '${col}'`);
       }
-
-      const barId = row.bar_id.trim();
-      const scaleId = deriveScaleId(row.edo ?? '', file);
-      if (!audioIndexByScale.has(scaleId)) {
-        audioIndexByScale.set(scaleId, await listAudioFileMap(scaleId));
-      }
-
-      const preferred = `${barId}.wav`;
-      const audioIndex = audioIndexByScale.get(scaleId)!;
-      const fileName = audioIndex.byName.get(preferred) ?? audioIndex.byLower.get(preferred.toLowerCase()) ?? preferred;
-      const audioPath = `audio/${scaleId}/${fileName}`;
-
-      try {
-        await fs.access(path.join(ROOT, audioPath));
-      } catch {
-        missingAudio.push(audioPath);
-      }
-
-      const edoVal = normalizeScaleId(row.edo) === 'harmonic' ? 'harmonic' : Number(row.edo);
-      bars.push({
-        barId,
-        scaleId,
-        instrumentId: row.instrument_id.trim(),
-        edo: edoVal === 'harmonic' || Number.isNaN(edoVal) ? (scaleId === 'harmonic' ? 'harmonic' : Number(scaleId.replace(/edo$/, ''))) : edoVal,
-        step: Number(row.step),
-        stepName: row.step_name.trim(),
-        centsFromStep0: Number(row.cents_from_step0),
-        ratioToStep0: row.ratio_to_step0.trim(),
-        ratioErrorCents: 0,
-        ratioPrimeLimit: null,
-        ratioSupported: true,
-        hz: Number(row.freq_if_step0_is_C),
-        audioPath,
-      });
+      // Normalize the edo column once; both the scale id and the numeric edo derive from it.
+      const edoRaw = row.edo ?? '';
+      const normalizedEdo = normalizeScaleId(edoRaw);
+      const scaleId = deriveScaleId(normalizedEdo, file);
+      rows.push({ row, scaleId, edo: deriveEdo(edoRaw, normalizedEdo, scaleId) });
     }
   }
 
+  const audioIndexByScale = new Map(
+    await Promise.all(
+      [...new Set(rows.map((r) => r.scaleId))].map(async (scaleId) => [scaleId, await listAudioFileMap(scaleId)] as const),
+    ),
+  );
+
+  // The directory listing already says which files exist, so no per-bar stat is needed.
+  const bars: Bar[] = await Promise.all(rows.map(async ({ row, scaleId, edo }) => {
+    const barId = row.bar_id.trim();
+    const preferred = `${barId}.wav`;
+    const audioIndex = audioIndexByScale.get(scaleId)!;
+    const listedName = audioIndex.byName.get(preferred) ?? audioIndex.byLower.get(preferred.toLowerCase());
+    const audioPath = `audio/${scaleId}/${listedName ?? preferred}`;
+    // The content hash keys the player's audio cache, so unchanged files survive redeploys.
+    // An unreadable file is reported as missing audio rather than failing the whole build.
+    const audioSha256 = listedName ? await sha256File(path.join(ROOT, audioPath)).catch(() => null) : null;
+
+    return {
+      barId,
+      scaleId,
+      instrumentId: row.instrument_id.trim(),
+      edo,
+      step: Number(row.step),
+      stepName: row.step_name.trim(),
+      centsFromStep0: Number(row.cents_from_step0),
+      ratioToStep0: row.ratio_to_step0.trim(),
+      ratioErrorCents: 0,
+      ratioPrimeLimit: null,
+      ratioSupported: true,
+      hz: Number(row.freq_if_step0_is_C),
+      audioPath,
+      audioSha256,
+    };
+  }));
+
+  // Collected after the hashes settle so the report follows manifest order.
+  const missingAudio = bars.filter((b) => !b.audioSha256).map((b) => b.audioPath);
   const validBars = bars.map((b) => BarSchema.parse(b));
 
   const scaleInstrumentGroups = new Map<string, Bar[]>();
@@ -187,7 +242,12 @@ async function main() {
     else scaleInstrumentGroups.set(key, [bar]);
   }
 
-  const barsWithRatios = [...scaleInstrumentGroups.entries()]
+  // The reference bar's hz comes straight from the manifest, so ratioToRef can be set while each bar is built.
+  const refBarId = 'harmonic-001';
+  const refHz = validBars.find((b) => b.barId === refBarId)?.hz;
+  if (!refHz) throw new Error('Missing ref bar harmonic-001 for ratio reference');
+
+  const barsWithRef = [...scaleInstrumentGroups.entries()]
     .sort(([a], [b]) => a.localeCompare(b))
     .flatMap(([, groupBars]) => {
       const isHarmonic = groupBars[0]?.scaleId === 'harmonic' || groupBars[0]?.edo === 'harmonic';
@@ -206,20 +266,21 @@ async function main() {
             ratioErrorCents: 0,
             ratioPrimeLimit: computeRatioPrimeLimit(ratioToStep0),
             ratioSupported: true,
+            ratioToRef: round6(bar.hz / refHz),
           };
         });
       }
 
       const stepZero = barsSorted.find((bar) => bar.step === 0);
-      let refHz = stepZero?.hz;
-      if (!refHz) {
+      let step0Hz = stepZero?.hz;
+      if (!step0Hz) {
         const fallback = barsSorted[0];
-        refHz = fallback.hz;
+        step0Hz = fallback.hz;
         console.warn(`Missing step=0 for group ${fallback.scaleId}/${fallback.instrumentId}; using ${fallback.barId} as reference`);
       }
 
       return barsSorted.map((bar) => {
-        const x = bar.hz / refHz;
+        const x = bar.hz / step0Hz;
         const quant = bestSimpleFractionConstrained(x, 64);
         const ratioToStep0 = normalizeFracString(quant.frac);
         if (!ratioToStep0.includes('/')) {
@@ -231,28 +292,33 @@ async function main() {
           ratioErrorCents: quant.errCents,
           ratioPrimeLimit: quant.ratioPrimeLimit,
           ratioSupported: quant.ratioSupported,
+          ratioToRef: round6(bar.hz / refHz),
         };
       });
     });
-  const refBarId = 'harmonic-001';
-  const refHz = barsWithRatios.find((b) => b.barId === refBarId)?.hz;
-  if (!refHz) throw new Error('Missing ref bar harmonic-001 for ratio reference');
-
-  const barsWithRef = barsWithRatios.map((bar) => ({
-    ...bar,
-    ratioToRef: bar.hz / refHz,
-  }));
-  const barsById = new Map(barsWithRef.map((b) => [b.barId, b]));
   const allBarsSorted = [...barsWithRef].sort((a, b) => a.hz - b.hz || a.barId.localeCompare(b.barId));
 
-  const scaleIds = [...new Set(barsWithRef.map((b) => b.scaleId))].sort((a, b) => {
+  const barsByScale = new Map<string, Bar[]>();
+  const instrumentGroups = new Map<string, Bar[]>();
+  for (const bar of barsWithRef) {
+    const scaleBars = barsByScale.get(bar.scaleId);
+    if (scaleBars) scaleBars.push(bar);
+    else barsByScale.set(bar.scaleId, [bar]);
+
+    const key = `${bar.scaleId}::${bar.instrumentId}`;
+    const current = instrumentGroups.get(key);
+    if (current) current.push(bar);
+    else instrumentGroups.set(key, [bar]);
+  }
+
+  const scaleIds = [...barsByScale.keys()].sort((a, b) => {
     if (a === 'harmonic') return 1;
     if (b === 'harmonic') return -1;
-    return a.localeCompare(b, undefined, { numeric: true });
+    return naturalCollator.compare(a, b);
   });
 
   const scales = scaleIds.map((sid) => {
-    const scaleBars = barsWithRef.filter((b) => b.scaleId === sid).sort((a, b) => a.step - b.step || a.barId.localeCompare(b.barId));
+    const scaleBars = barsByScale.get(sid)!.sort((a, b) => a.step - b.step || a.barId.localeCompare(b.barId));
     const edo = sid === 'harmonic' ? 'harmonic' : Number((sid.match(/^(\d+)edo$/)?.[1] ?? Number.NaN));
     return {
       scaleId: sid,
@@ -263,20 +329,15 @@ async function main() {
     };
   });
 
-  const instrumentGroups = new Map<string, Bar[]>();
-  for (const bar of barsWithRef) {
-    const key = `${bar.scaleId}::${bar.instrumentId}`;
-    const current = instrumentGroups.get(key);
-    if (current) current.push(bar);
-    else instrumentGroups.set(key, [bar]);
-  }
-
   const instruments = [...instrumentGroups.entries()]
     .sort(([a], [b]) => a.localeCompare(b))
     .map(([, groupBars]) => {
       const ordered = [...groupBars].sort((a, b) => a.step - b.step || a.barId.localeCompare(b.barId));
       const stepZero = ordered.find((bar) => bar.step === 0);
-      const defaultBar = stepZero ?? [...ordered].sort((a, b) => a.barId.localeCompare(b.barId))[0];
+      let defaultBar = stepZero ?? ordered[0];
+      if (!stepZero) {
+        for (const bar of ordered) if (bar.barId.localeCompare(defaultBar.barId) < 0) defaultBar = bar;
+      }
       const first = ordered[0];
       return {
         instrumentId: first.instrumentId,
@@ -291,22 +352,33 @@ async function main() {
   const clustersByTolerance = Object.fromEntries(
     TOLS.map((tol) => {
       const groups = splitByRep(allBarsSorted, tol).map((membersRaw) => {
-        const members = membersRaw.map((m) => m.barId).sort((a, b) => a.localeCompare(b));
-        const repBarId = members[0];
-        const repHz = barsById.get(repBarId)!.hz;
-        const cents = members.map((m) => centsDiff(barsById.get(m)!.hz, repHz));
-        const hzVals = members.map((m) => barsById.get(m)!.hz);
+        const sortedMembers = [...membersRaw].sort((a, b) => a.barId.localeCompare(b.barId));
+        const repBarId = sortedMembers[0].barId;
+        const repHz = sortedMembers[0].hz;
+        let minHz = Number.POSITIVE_INFINITY;
+        let maxHz = Number.NEGATIVE_INFINITY;
+        let sumHz = 0;
+        let minCents = Number.POSITIVE_INFINITY;
+        let maxCents = Number.NEGATIVE_INFINITY;
+        for (const member of sortedMembers) {
+          const cents = centsDiff(member.hz, repHz);
+          if (member.hz < minHz) minHz = member.hz;
+          if (member.hz > maxHz) maxHz = member.hz;
+          if (cents < minCents) minCents = cents;
+          if (cents > maxCents) maxCents = cents;
+          sumHz += member.hz;
+        }
         return {
           groupId: `tol${tol}-${repBarId}`,
           repBarId,
           repHz,
-          members,
+          members: sortedMembers.map((m) => m.barId),
           stats: {
-            minHz: Math.min(...hzVals),
-            maxHz: Math.max(...hzVals),
-            meanHz: hzVals.reduce((a, b) => a + b, 0) / hzVals.length,
-            maxCentsSpread: Math.max(...cents) - Math.min(...cents),
-            count: members.length,
+            minHz,
+            maxHz,
+            meanHz: round6(sumHz / sortedMembers.length),
+            maxCentsSpread: round6(maxCents - minCents),
+            count: sortedMembers.length,
           },
         };
       });
@@ -320,27 +392,28 @@ async function main() {
     toleranceCentsPresets: [...TOLS],
   };
 
-  const repoVersion = (await fs.readFile(path.join(ROOT, '.git', 'HEAD'), 'utf8').catch(() => '')).trim() || undefined;
-
   for (const bar of allBarsSorted) {
     if (!bar.ratioToStep0.includes('/')) {
       throw new Error(`Invalid ratioToStep0 '${bar.ratioToStep0}' for ${bar.barId}`);
     }
   }
 
-  await fs.writeFile(path.join(DATA_DIR, 'bars.json'), `${JSON.stringify(allBarsSorted, null, 2)}\n`);
-  await fs.writeFile(path.join(DATA_DIR, 'scales.json'), `${JSON.stringify(scales, null, 2)}\n`);
-  await fs.writeFile(path.join(DATA_DIR, 'instruments.json'), `${JSON.stringify(instruments, null, 2)}\n`);
-  await fs.writeFile(path.join(DATA_DIR, 'pitch_index.json'), `${JSON.stringify(pitchIndex, null, 2)}\n`);
-  await fs.writeFile(path.join(DATA_DIR, 'buildInfo.json'), `${JSON.stringify({
-    generatedAt: new Date().toISOString(),
-    repoVersion,
-    tolerancesCents: [...TOLS],
-    algorithm: 'adjacency-cluster with lexicographic representative revalidation split',
-    refBarId,
-    refPitchHz: refHz,
-    ratioReference: 'all ratios relative to harmonic-001',
-  }, null, 2)}\n`);
+  await Promise.all([
+    // Files the app fetches at runtime are written compact; buildInfo stays indented for people reading it.
+    writeJson('bars.json', allBarsSorted, { compact: true }),
+    writeJson('scales.json', scales, { compact: true }),
+    writeJson('instruments.json', instruments, { compact: true }),
+    writeJson('pitch_index.json', pitchIndex, { compact: true }),
+    writeJson('buildInfo.json', {
+      generatedAt: new Date().toISOString(),
+      repoVersion,
+      tolerancesCents: [...TOLS],
+      algorithm: 'adjacency-cluster with lexicographic representative revalidation split',
+      refBarId,
+      refPitchHz: refHz,
+      ratioReference: 'all ratios relative to harmonic-001',
+    }),
+  ]);
 
   if (missingAudio.length) {
     console.warn(`Missing audio (${missingAudio.length}):`);
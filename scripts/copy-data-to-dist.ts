@@ -1,3 +1,4 @@
+import { constants } from 'node:fs';
 import fs from 'node:fs/promises';
 import path from 'node:path';
 
@@ -10,7 +11,7 @@ async function copyDir(src: string, dest: string): Promise<void> {
     if (entry.isDirectory()) {
       await copyDir(from, to);
     } else {
-      await fs.copyFile(from, to);
+      await fs.copyFile(from, to, constants.COPYFILE_FICLONE);
     }
   }
 }
@@ -3,13 +3,30 @@ import path from "node:path";
 
 const root = process.cwd();
 
-function copyDir(from, to) {
+// Mirror `from` into `to`, copying only files whose size or mtime changed and removing stale entries.
+function syncDir(from, to) {
   fs.mkdirSync(to, { recursive: true });
+  const wanted = new Set();
   for (const ent of fs.readdirSync(from, { withFileTypes: true })) {
+    wanted.add(ent.name);
     const a = path.join(from, ent.name);
     const b = path.join(to, ent.name);
-    if (ent.isDirectory()) copyDir(a, b);
-    else fs.copyFileSync(a, b);
+    const existing = fs.statSync(b, { throwIfNoEntry: false });
+    if (ent.isDirectory()) {
+      if (existing && !existing.isDirectory()) fs.rmSync(b, { force: true });
+      syncDir(a, b);
+      continue;
+    }
+    const source = fs.statSync(a);
+    if (existing?.isFile() && existing.size === source.size && Math.trunc(existing.mtimeMs) === Math.trunc(source.mtimeMs)) continue;
+    if (existing) fs.rmSync(b, { recursive: true, force: true });
+    // Reflink where the filesystem supports it; Node falls back to a regular copy otherwise.
+    fs.copyFileSync(a, b, fs.constants.COPYFILE_FICLONE);
+    // Carry the source mtime over (at millisecond precision) so the next run can recognise the file as unchanged.
+    fs.utimesSync(b, source.atime, source.mtime);
+  }
+  for (const name of fs.readdirSync(to)) {
+    if (!wanted.has(name)) fs.rmSync(path.join(to, name), { recursive: true, force: true });
   }
 }
 
@@ -22,10 +39,8 @@ function ensureCopied(srcRel, dstRel) {
     process.exit(1);
   }
 
-  fs.rmSync(dst, { recursive: true, force: true });
-  fs.mkdirSync(dst, { recursive: true });
-  copyDir(src, dst);
-  console.log(`[copy-public-assets] copied ${srcRel} -> ${dstRel}`);
+  syncDir(src, dst);
+  console.log(`[copy-public-assets] synced ${srcRel} -> ${dstRel}`);
 }
 
 ensureCopied("audio", path.join("public", "audio"));
@@ -23,7 +23,7 @@ type SequenceState = {
 type PlayAllPlan = {
   barIds: BarId[];
   durationsByIndex: number[];
-  bufferPromises: Promise<AudioBuffer>[];
+  getBufferAt: (index: number) => Promise<AudioBuffer>;
 };
 
 const PLAYALL_PREROLL_S = 0.18;
@@ -117,7 +117,10 @@ export function AudioProvider({ children }: { children: React.ReactNode }) {
 
   useEffect(() => {
     primeOnFirstUserGesture(engine.context);
-    loadBars().then((bars) => engine.setPathMap(Object.fromEntries(bars.map((b) => [b.barId, b.audioPath]))));
+    loadBars().then((bars) => {
+      engine.setPathMap(Object.fromEntries(bars.map((b) => [b.barId, b.audioPath])));
+      engine.setContentHashMap(Object.fromEntries(bars.flatMap((b) => (b.audioSha256 ? [[b.barId, b.audioSha256]] : []))));
+    });
     return () => {
       endTimers.current.forEach((timer) => window.clearTimeout(timer));
       endTimers.current.clear();
@@ -176,9 +179,20 @@ export function AudioProvider({ children }: { children: React.ReactNode }) {
       performance.mark('playall_prepare_start');
     }
     const { durationsByIndex, barIds: plannedBarIds } = buildPlan(barIds, opts);
-    const bufferPromises = plannedBarIds.map((barId) => engine.getBuffer(barId));
-    const preloadCount = Math.min(plannedBarIds.length, PLAYALL_PRELOAD_BARS);
-    await Promise.all(bufferPromises.slice(0, preloadCount));
+    // Loads run at most PLAYALL_PRELOAD_BARS ahead of the scheduler rather than all being requested up front,
+    // so long sequences don't saturate the network and decoder before the first bars are ready.
+    const bufferPromises: Promise<AudioBuffer>[] = [];
+    const prefetchThrough = (end: number) => {
+      for (let i = bufferPromises.length; i < Math.min(end, plannedBarIds.length); i += 1) {
+        bufferPromises.push(engine.getBuffer(plannedBarIds[i]));
+      }
+    };
+    const getBufferAt = (index: number) => {
+      prefetchThrough(index + PLAYALL_PRELOAD_BARS);
+      return bufferPromises[index];
+    };
+    prefetchThrough(PLAYALL_PRELOAD_BARS);
+    await Promise.all(bufferPromises);
     if (import.meta.env.DEV) {
       performance.mark('playall_prepare_end');
       try {
@@ -191,7 +205,7 @@ export function AudioProvider({ children }: { children: React.ReactNode }) {
     return {
       barIds: plannedBarIds,
       durationsByIndex,
-      bufferPromises,
+      getBufferAt,
     } satisfies PlayAllPlan;
   }, [engine]);
 
@@ -267,9 +281,11 @@ export function AudioProvider({ children }: { children: React.ReactNode }) {
     if (!barIds.length) return;
     mark('playall_click');
 
-    const oldestActiveVoiceId = voices
-      .slice()
-      .sort((a, b) => a.startedAt - b.startedAt)[0]?.id;
+    let oldestActiveVoice: Voice | undefined;
+    for (const voice of voices) {
+      if (!oldestActiveVoice || voice.startedAt < oldestActiveVoice.startedAt) oldestActiveVoice = voice;
+    }
+    const oldestActiveVoiceId = oldestActiveVoice?.id;
     const protectedVoiceIds = oldestActiveVoiceId ? new Set([oldestActiveVoiceId]) : undefined;
 
     stopSequenceInternal({ protectedVoiceIds });
@@ -333,7 +349,7 @@ export function AudioProvider({ children }: { children: React.ReactNode }) {
     let firstScheduled = false;
 
     const scheduleIndex = (i: number, scheduleTime: number) => {
-      void plan.bufferPromises[i].then((buffer) => {
+      void plan.getBufferAt(i).then((buffer) => {
         if (token !== playSequenceToken.current) return;
         const id = engine.playBufferAt(plan.barIds[i], buffer, scheduleTime, { gain: opts.gain });
         ids[i] = id;
@@ -3,6 +3,8 @@ import { ensureAudioReady } from './iosUnmute';
 
 let sharedContext: AudioContext | null = null;
 
+const AUDIO_CACHE_NAME = 'microrimba-audio-v1';
+
 function getSharedAudioContext() {
   if (!sharedContext) {
     sharedContext = new AudioContext();
@@ -23,12 +25,18 @@ export class AudioEngine {
   private bufferCache = new Map<string, AudioBuffer>();
   private inflight = new Map<string, Promise<AudioBuffer>>();
   private pathByBar = new Map<BarId, string>();
+  private hashByBar = new Map<BarId, string>();
   private active = new Map<string, { source: AudioBufferSourceNode; gain: GainNode }>();
 
   setPathMap(pathMap: Record<string, string>) {
     this.pathByBar = new Map(Object.entries(pathMap));
   }
 
+  setContentHashMap(hashMap: Record<string, string>) {
+    this.hashByBar = new Map(Object.entries(hashMap));
+    void this.pruneAudioCache(new Set(this.hashByBar.values())).catch(() => undefined);
+  }
+
   canPlay(barId: BarId) {
     return this.pathByBar.has(barId);
   }
@@ -42,10 +50,8 @@ export class AudioEngine {
     if (this.bufferCache.has(url)) return this.bufferCache.get(url)!;
     if (this.inflight.has(url)) return this.inflight.get(url)!;
 
-    const load = fetch(url)
-      .then(async (res) => {
-        if (!res.ok) throw new Error(`Missing audio: ${url}`);
-        const arr = await res.arrayBuffer();
+    const load = this.fetchAudioBytes(url, this.hashByBar.get(barId))
+      .then(async (arr) => {
         const decoded = await this.context.decodeAudioData(arr);
         this.bufferCache.set(url, decoded);
         return decoded;
@@ -107,6 +113,32 @@ export class AudioEngine {
     [...this.active.keys()].forEach((id) => this.stopVoice(id));
   }
 
+  // Entries are keyed by content hash, so replaced or removed samples would otherwise stay cached forever.
+  private async pruneAudioCache(liveHashes: Set<string>) {
+    // An empty map means the bars carry no hashes yet; keep what is cached rather than wiping it.
+    if (!liveHashes.size || !('caches' in globalThis)) return;
+    const cache = await caches.open(AUDIO_CACHE_NAME);
+    const keys = await cache.keys();
+    await Promise.all(
+      keys
+        .filter((req) => !liveHashes.has(req.url.slice(req.url.lastIndexOf('/') + 1)))
+        .map((req) => cache.delete(req)),
+    );
+  }
+
+  // Bytes are cached under their content hash, so a rebuilt site only refetches files that changed.
+  private async fetchAudioBytes(url: string, sha256: string | undefined): Promise<ArrayBuffer> {
+    const cache = sha256 && 'caches' in globalThis ? await caches.open(AUDIO_CACHE_NAME).catch(() => null) : null;
+    const key = `${import.meta.env.BASE_URL}__audio-cache__/${sha256}`;
+    const cached = cache ? await cache.match(key).catch(() => undefined) : undefined;
+    if (cached) return cached.arrayBuffer();
+
+    const res = await fetch(url);
+    if (!res.ok) throw new Error(`Missing audio: ${url}`);
+    if (cache) void cache.put(key, res.clone()).catch(() => undefined);
+    return res.arrayBuffer();
+  }
+
   private resolveUrl(barId: BarId): string {
     const path = this.pathByBar.get(barId);
     if (!path) throw new Error(`Missing audio path for ${barId}`);
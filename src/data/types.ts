@@ -17,6 +17,7 @@ export type Bar = {
   ratioToRef: number;
   hz: number;
   audioPath: string;
+  audioSha256: string | null;
 };
 
 export type Scale = {
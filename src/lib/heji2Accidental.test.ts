@@ -1,5 +1,10 @@
-import { describe, expect, it } from 'vitest';
-import { getPitchLabelModel } from './pitchLabel';
+import { beforeEach, describe, expect, it } from 'vitest';
+import { bestMicroFractionConstrained, computeHzPrimeLimit } from './heji2Accidental';
+import { getPitchLabelModel, resetPitchLabelCaches } from './pitchLabel';
+
+beforeEach(() => {
+  resetPitchLabelCaches();
+});
 
 describe('heji display invariants', () => {
   it('never emits arrows', () => {
@@ -14,3 +19,16 @@ describe('heji display invariants', () => {
     expect(model.display.centsText).toMatch(/^[+-]\d+c$/);
   });
 });
+
+describe('computeHzPrimeLimit', () => {
+  it('matches a per-limit search for every limit it reports', () => {
+    for (const microRatio of [1, 1.0123, 0.9871, 1.0289, 0.9712, 1.0045]) {
+      const { bestByLimit } = computeHzPrimeLimit(microRatio);
+      for (const [limit, best] of Object.entries(bestByLimit)) {
+        const expected = bestMicroFractionConstrained(microRatio, Number(limit));
+        expect(best.frac).toBe(expected.frac);
+        expect(best.errCents).toBeCloseTo(expected.errCents, 9);
+      }
+    }
+  });
+});
@@ -1,7 +1,7 @@
 import { getDiatonicGlyph, getPrimeGlyph, type DiatonicAccidental } from './heji2Mapping';
 import {
   factorizeInt,
-  maxPrimeFactorFromFactorMap,
+  maxPrimeFactor,
   reduceFraction,
 } from './primeFactor';
 import { computeRatioPrimeLimit, HEJI2_ALLOWED_PRIMES } from './ratioQuantize';
@@ -34,71 +34,100 @@ function clamp(v: number, lo: number, hi: number): number {
   return Math.max(lo, Math.min(hi, v));
 }
 
-function isAllowedPrime(prime: number, limit: number): boolean {
-  return HEJI2_ALLOWED_PRIMES.includes(prime as (typeof HEJI2_ALLOWED_PRIMES)[number]) && prime <= limit;
-}
-
 export function computeHzMicroRatio(hz: number, midiBase: number): number {
   const baseHz = 440 * 2 ** ((midiBase - 69) / 12);
   return hz / baseHz;
 }
 
 export function bestMicroFractionConstrained(microRatio: number, limit: number, maxDen = 64): BestMicro {
-  let best: BestMicro = {
-    p: 1,
-    q: 1,
-    frac: '1/1',
-    errCents: Number.POSITIVE_INFINITY,
-    pFactors: factorizeInt(1),
-    qFactors: factorizeInt(1),
-  };
+  const maxAllowedPrime = Math.min(limit, HEJI2_ALLOWED_PRIMES[HEJI2_ALLOWED_PRIMES.length - 1]);
+  let bestP = 1;
+  let bestQ = 1;
+  let bestErrCents = Number.POSITIVE_INFINITY;
 
   for (let q = 1; q <= maxDen; q += 1) {
+    // Scores are bounded below by 0.08 * q; once that reaches the best score, stop searching.
+    if (0.08 * q >= Math.abs(bestErrCents) + 0.08 * bestQ) break;
     const p0 = Math.max(1, Math.round(microRatio * q));
-    for (const pTry of [p0 - 1, p0, p0 + 1]) {
+    for (let pTry = p0 - 1; pTry <= p0 + 1; pTry += 1) {
       if (pTry <= 0) continue;
       const reduced = reduceFraction(pTry, q);
-      const pFactors = factorizeInt(reduced.p);
-      const qFactors = factorizeInt(reduced.q);
-
-      let supported = true;
-      for (const prime of [...pFactors.keys(), ...qFactors.keys()]) {
-        if (!isAllowedPrime(prime, limit)) {
-          supported = false;
-          break;
-        }
-      }
-      if (!supported) continue;
+      // HEJI2 covers every prime up to 31, so the limit check only needs the largest prime factor.
+      if (maxPrimeFactor(reduced.p) > maxAllowedPrime || maxPrimeFactor(reduced.q) > maxAllowedPrime) continue;
 
       const approx = reduced.p / reduced.q;
       const errCents = cents(microRatio / approx);
       const score = Math.abs(errCents) + 0.08 * reduced.q;
 
-      const currentBestScore = Math.abs(best.errCents) + 0.08 * best.q;
+      const currentBestScore = Math.abs(bestErrCents) + 0.08 * bestQ;
       if (score < currentBestScore) {
-        best = {
-          p: reduced.p,
-          q: reduced.q,
-          frac: `${reduced.p}/${reduced.q}`,
-          errCents,
-          pFactors,
-          qFactors,
-        };
+        bestP = reduced.p;
+        bestQ = reduced.q;
+        bestErrCents = errCents;
       }
     }
   }
 
-  return best;
+  return {
+    p: bestP,
+    q: bestQ,
+    frac: `${bestP}/${bestQ}`,
+    errCents: bestErrCents,
+    pFactors: factorizeInt(bestP),
+    qFactors: factorizeInt(bestQ),
+  };
 }
 
-export function computeHzPrimeLimit(microRatio: number): { hzPrimeLimit: number; bestByLimit: Record<number, BestMicro> } {
-  const limits = [3, 5, 7, 11, 13, 17, 19, 23, 29, 31];
-  const bestByLimit: Record<number, BestMicro> = {};
+const HZ_PRIME_LIMITS = [3, 5, 7, 11, 13, 17, 19, 23, 29, 31];
+
+export function computeHzPrimeLimit(
+  microRatio: number,
+  maxDen = 64,
+): { hzPrimeLimit: number; bestByLimit: Record<number, BestMicro> } {
+  // A candidate that fits one limit fits every larger limit too, so a single sweep over the
+  // candidates tracks the winner for each limit instead of re-running the search per limit.
+  // Scan order and strict improvement match bestMicroFractionConstrained, so winners are identical.
+  const bestP = HZ_PRIME_LIMITS.map(() => 1);
+  const bestQ = HZ_PRIME_LIMITS.map(() => 1);
+  const bestErrCents = HZ_PRIME_LIMITS.map(() => Number.POSITIVE_INFINITY);
+  const bestScore = HZ_PRIME_LIMITS.map(() => Number.POSITIVE_INFINITY);
 
-  for (const limit of limits) {
-    const best = bestMicroFractionConstrained(microRatio, limit);
-    bestByLimit[limit] = best;
-    if (Math.abs(best.errCents) <= 5) {
+  for (let q = 1; q <= maxDen; q += 1) {
+    // The 3-limit winner has the worst score of all limits, so it bounds the pruning for every limit.
+    if (0.08 * q >= bestScore[0]) break;
+    const p0 = Math.max(1, Math.round(microRatio * q));
+    for (let pTry = p0 - 1; pTry <= p0 + 1; pTry += 1) {
+      if (pTry <= 0) continue;
+      const reduced = reduceFraction(pTry, q);
+      const maxPrime = Math.max(maxPrimeFactor(reduced.p), maxPrimeFactor(reduced.q));
+      let first = 0;
+      while (first < HZ_PRIME_LIMITS.length && HZ_PRIME_LIMITS[first] < maxPrime) first += 1;
+      if (first === HZ_PRIME_LIMITS.length) continue;
+
+      const errCents = cents(microRatio / (reduced.p / reduced.q));
+      const score = Math.abs(errCents) + 0.08 * reduced.q;
+      for (let i = first; i < HZ_PRIME_LIMITS.length; i += 1) {
+        if (score >= bestScore[i]) continue;
+        bestP[i] = reduced.p;
+        bestQ[i] = reduced.q;
+        bestErrCents[i] = errCents;
+        bestScore[i] = score;
+      }
+    }
+  }
+
+  const bestByLimit: Record<number, BestMicro> = {};
+  for (let i = 0; i < HZ_PRIME_LIMITS.length; i += 1) {
+    const limit = HZ_PRIME_LIMITS[i];
+    bestByLimit[limit] = {
+      p: bestP[i],
+      q: bestQ[i],
+      frac: `${bestP[i]}/${bestQ[i]}`,
+      errCents: bestErrCents[i],
+      pFactors: factorizeInt(bestP[i]),
+      qFactors: factorizeInt(bestQ[i]),
+    };
+    if (Math.abs(bestErrCents[i]) <= 5) {
       return { hzPrimeLimit: limit, bestByLimit };
     }
   }
@@ -130,10 +159,11 @@ export function renderHeji2Accidental({
 }): Heji2AccidentalResult {
   const microRatio = computeHzMicroRatio(hz, midiBase);
   const ratioPrimeLimit = computeRatioPrimeLimit(ratioFrac);
-  const { hzPrimeLimit } = computeHzPrimeLimit(microRatio);
+  const { hzPrimeLimit, bestByLimit } = computeHzPrimeLimit(microRatio);
   const ratioOverLimit = ratioPrimeLimit > 31;
   const finalLimit = ratioOverLimit ? clamp(hzPrimeLimit, 3, 31) : computeFinalLimit({ ratioPrimeLimit, hzPrimeLimit });
-  const best = bestMicroFractionConstrained(microRatio, finalLimit);
+  // The limit search already found this fraction whenever the hz limit decides the final limit.
+  const best = bestByLimit[finalLimit] ?? bestMicroFractionConstrained(microRatio, finalLimit);
 
   const exponentMap = subtractFactors(best.pFactors, best.qFactors);
   const primeGlyphs: string[] = [];
@@ -22,7 +22,7 @@ function pickFirstGlyph(value: GlyphRecord[] | DirGlyph | undefined, dir?: Prime
   return value[dir]?.[0]?.glyph ?? '';
 }
 
-export function getDiatonicGlyph(acc: DiatonicAccidental): string {
+function resolveDiatonicGlyph(acc: DiatonicAccidental): string {
   if (acc === '') return '';
   const dir: PrimeDirection = acc.includes('#') ? 'up' : 'down';
   const count = acc.length as 1 | 2;
@@ -34,6 +34,34 @@ export function getDiatonicGlyph(acc: DiatonicAccidental): string {
   return pickFirstGlyph(HEJI2Mapping.diatonicAccidentals[fallbackKey], dir);
 }
 
+// The mapping is static, so resolve every glyph once instead of walking the JSON per lookup.
+const DIATONIC_GLYPHS: Record<DiatonicAccidental, string> = {
+  '': '',
+  b: resolveDiatonicGlyph('b'),
+  '#': resolveDiatonicGlyph('#'),
+  bb: resolveDiatonicGlyph('bb'),
+  '##': resolveDiatonicGlyph('##'),
+};
+
+const primeGlyphIndex = (prime: number, mag: number, dir: PrimeDirection) => prime * 8 + mag * 2 + (dir === 'up' ? 0 : 1);
+
+const PRIME_GLYPHS: string[] = (() => {
+  const table = new Array<string>(primeGlyphIndex(31, 3, 'down') + 1).fill('');
+  for (const [prime, byMagnitude] of Object.entries(HEJI2Mapping.primeComponents)) {
+    for (const [mag, byDirection] of Object.entries(byMagnitude)) {
+      for (const dir of ['up', 'down'] as const) {
+        const index = primeGlyphIndex(Number(prime), Number(mag), dir);
+        if (index < table.length) table[index] = byDirection[dir]?.[0]?.glyph ?? '';
+      }
+    }
+  }
+  return table;
+})();
+
+export function getDiatonicGlyph(acc: DiatonicAccidental): string {
+  return DIATONIC_GLYPHS[acc] ?? '';
+}
+
 export function getPrimeGlyph(prime: HejiPrime, mag: PrimeMagnitude, dir: PrimeDirection): string {
-  return HEJI2Mapping.primeComponents[String(prime)]?.[String(mag)]?.[dir]?.[0]?.glyph ?? '';
+  return PRIME_GLYPHS[primeGlyphIndex(prime, mag, dir)] ?? '';
 }
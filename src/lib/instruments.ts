@@ -9,8 +9,10 @@ export function getInstrumentMeta(instruments: InstrumentsJson, instrumentId: st
 }
 
 export function getDefaultInstrumentForScale(instruments: InstrumentsJson, scaleId: ScaleId) {
-  const matches = instruments.filter((instrument) => instrument.scaleId === scaleId).sort((a, b) => a.instrumentId.localeCompare(b.instrumentId));
-  if (!matches.length) return null;
-  if (matches.length === 1) return matches[0].instrumentId;
-  return matches[0].instrumentId;
+  let first: string | null = null;
+  for (const instrument of instruments) {
+    if (instrument.scaleId !== scaleId) continue;
+    if (first === null || instrument.instrumentId.localeCompare(first) < 0) first = instrument.instrumentId;
+  }
+  return first;
 }
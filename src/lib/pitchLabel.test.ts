@@ -1,5 +1,23 @@
-import { describe, expect, it } from 'vitest';
-import { MAX_TOTAL_PRIME_GLYPHS, getPitchLabelModel } from './pitchLabel';
+import { beforeEach, describe, expect, it } from 'vitest';
+import { MAX_TOTAL_PRIME_GLYPHS, getPitchLabelModel, nearestMidiWithPitchClass, resetPitchLabelCaches } from './pitchLabel';
+
+beforeEach(() => {
+  resetPitchLabelCaches();
+});
+
+describe('nearestMidiWithPitchClass', () => {
+  it('picks the closest midi note carrying the pitch class', () => {
+    expect(nearestMidiWithPitchClass(60.2, 0)).toBe(60);
+    expect(nearestMidiWithPitchClass(65.9, 0)).toBe(60);
+    expect(nearestMidiWithPitchClass(66.1, 0)).toBe(72);
+    expect(nearestMidiWithPitchClass(61.4, 3)).toBe(63);
+  });
+
+  it('prefers the upper carrier on exact ties', () => {
+    expect(nearestMidiWithPitchClass(66, 0)).toBe(72);
+    expect(nearestMidiWithPitchClass(-6, 0)).toBe(0);
+  });
+});
 
 describe('pitchLabel ratio-driven HEJI', () => {
   it('no arrows invariant', () => {
@@ -52,6 +70,14 @@ describe('pitchLabel ratio-driven HEJI', () => {
     expect(model.heji.primeGlyphInfo.some((info) => info.magnitude === 2)).toBe(true);
   });
 
+  it('memoizes on the resolved reference, not just hz and ratio', () => {
+    const first = getPitchLabelModel({ hz: 300, ratio_to_step0: '3/2', refHzStep0: 200 });
+    expect(getPitchLabelModel({ hz: 300, ratio_to_step0: '3/2', refHzStep0: 200 })).toBe(first);
+    const shifted = getPitchLabelModel({ hz: 300, ratio_to_step0: '3/2', refHzStep0: 190 });
+    expect(shifted).not.toBe(first);
+    expect(shifted.expectedHz).toBeCloseTo(285, 9);
+  });
+
   it('caps total prime glyphs and falls back', () => {
     const model = getPitchLabelModel({ hz: 440, ratio_to_step0: '390625/16807', instrumentId: 'test' }); // 5^8 / 7^5
     expect(model.heji.primeGlyphs.length).toBeLessThanOrEqual(MAX_TOTAL_PRIME_GLYPHS);
@@ -54,35 +54,33 @@ const PITCH_CLASS_SPELLINGS: Array<{ letter: PitchLetter; accidental: '' | '#' |
 ];
 
 const refHzByInstrument = new Map<string, number>();
+type RatioFactors = {
+  parsed: { p: number; q: number } | null;
+  factors: Map<number, number>;
+  ratioPrimeLimit: number;
+  unsupportedPrimeFound: boolean;
+};
+
+const ratioFactorsCache = new Map<string, RatioFactors>();
+const MODEL_CACHE_LIMIT = 4096;
+const modelCache = new Map<string, PitchLabelModel>();
+
+// Clears the per-instrument reference and memoized models so results don't depend on earlier calls.
+export function resetPitchLabelCaches(): void {
+  refHzByInstrument.clear();
+  modelCache.clear();
+}
 
 function ratioToNumber(p: number, q: number): number {
   if (!Number.isFinite(p) || !Number.isFinite(q) || q === 0) return 1;
   return p / q;
 }
 
-function getRatioPrimeLimit(factors: Map<number, number>): number {
-  let max = 3;
-  for (const [prime, exp] of factors.entries()) {
-    if (prime <= 3 || exp === 0) continue;
-    max = Math.max(max, prime);
-  }
-  return max;
-}
-
-function nearestMidiWithPitchClass(midiFloatExpected: number, pitchClass: number): number {
-  const lo = Math.floor(midiFloatExpected) - 24;
-  const hi = Math.ceil(midiFloatExpected) + 24;
-  let best = lo;
-  let bestDist = Number.POSITIVE_INFINITY;
-  for (let midi = lo; midi <= hi; midi += 1) {
-    if ((((midi % 12) + 12) % 12) !== pitchClass) continue;
-    const dist = Math.abs(midi - midiFloatExpected);
-    if (dist < bestDist || (dist === bestDist && midi > best)) {
-      best = midi;
-      bestDist = dist;
-    }
-  }
-  return best;
+export function nearestMidiWithPitchClass(midiFloatExpected: number, pitchClass: number): number {
+  // Only the two carriers bracketing the target can be nearest; ties go to the upper one.
+  const below = pitchClass + 12 * Math.floor((midiFloatExpected - pitchClass) / 12);
+  const above = below + 12;
+  return above - midiFloatExpected <= midiFloatExpected - below ? above : below;
 }
 
 export function parseRatio(ratio: string): { p: number; q: number } | null {
@@ -97,6 +95,27 @@ export function parseRatio(ratio: string): { p: number; q: number } | null {
   return { p, q };
 }
 
+// The dataset only uses a few dozen distinct ratio strings, so parse and factor each one once.
+function getRatioFactors(ratio: string): RatioFactors {
+  let cached = ratioFactorsCache.get(ratio);
+  if (!cached) {
+    const parsed = parseRatio(ratio);
+    const { p, q } = parsed ?? { p: 1, q: 1 };
+    const factors = factorFrac(p, q);
+    // One pass yields both the prime limit and whether any prime lacks a HEJI glyph.
+    let ratioPrimeLimit = 3;
+    let unsupportedPrimeFound = false;
+    for (const [prime, exp] of factors.entries()) {
+      if (prime <= 3 || exp === 0) continue;
+      ratioPrimeLimit = Math.max(ratioPrimeLimit, prime);
+      if (!PRIME_ORDER.includes(prime as HejiPrime)) unsupportedPrimeFound = true;
+    }
+    cached = { parsed, factors, ratioPrimeLimit, unsupportedPrimeFound };
+    ratioFactorsCache.set(ratio, cached);
+  }
+  return cached;
+}
+
 function pitchClassToSpelling(pc: number): { letter: PitchLetter; accidental: '' | '#' | 'b' } {
   return PITCH_CLASS_SPELLINGS[((pc % 12) + 12) % 12];
 }
@@ -146,18 +165,8 @@ export function getPitchLabelModel(args: {
     };
   }
 
-  const parsedRatio = parseRatio(ratio_to_step0);
+  const { parsed: parsedRatio, factors, ratioPrimeLimit, unsupportedPrimeFound } = getRatioFactors(ratio_to_step0);
   const { p, q } = parsedRatio ?? { p: 1, q: 1 };
-  const factors = factorFrac(p, q);
-  const midiFloat = 69 + 12 * Math.log2(hz / 440);
-  const ratioFloat = parsedRatio ? ratioToNumber(parsedRatio.p, parsedRatio.q) : Number.NaN;
-  const semitonesFloat = Number.isFinite(ratioFloat) && ratioFloat > 0 ? 12 * Math.log2(ratioFloat) : Number.NaN;
-  const semitonesRounded = Number.isFinite(semitonesFloat) ? Math.round(semitonesFloat) : Number.NaN;
-  const pitchClass = Number.isFinite(semitonesRounded)
-    ? ((semitonesRounded % 12) + 12) % 12
-    : ((Math.round(midiFloat) % 12) + 12) % 12;
-
-  const spelling = pitchClassToSpelling(pitchClass);
   const ratio = ratioToNumber(p, q);
   let step0Ref = refHzStep0;
 
@@ -172,6 +181,20 @@ export function getPitchLabelModel(args: {
     refHzByInstrument.set(instrumentId, step0Ref);
   }
 
+  // Everything below depends only on hz, the ratio string and the resolved reference, so key on exactly those.
+  const modelCacheKey = `${hz}|${ratio_to_step0}|${step0Ref}`;
+  const cachedModel = modelCache.get(modelCacheKey);
+  if (cachedModel) return cachedModel;
+
+  const midiFloat = 69 + 12 * Math.log2(hz / 440);
+  const ratioFloat = parsedRatio ? ratioToNumber(parsedRatio.p, parsedRatio.q) : Number.NaN;
+  const semitonesFloat = Number.isFinite(ratioFloat) && ratioFloat > 0 ? 12 * Math.log2(ratioFloat) : Number.NaN;
+  const semitonesRounded = Number.isFinite(semitonesFloat) ? Math.round(semitonesFloat) : Number.NaN;
+  const pitchClass = Number.isFinite(semitonesRounded)
+    ? ((semitonesRounded % 12) + 12) % 12
+    : ((Math.round(midiFloat) % 12) + 12) % 12;
+
+  const spelling = pitchClassToSpelling(pitchClass);
   const expectedHz = step0Ref * ratio;
   const midiFloatExpected = 69 + 12 * Math.log2(expectedHz / 440);
   const midiBase = nearestMidiWithPitchClass(midiFloat, pitchClass);
@@ -186,16 +209,7 @@ export function getPitchLabelModel(args: {
   const diatonicGlyph = getDiatonicGlyph(spelling.accidental);
   const primeGlyphInfo: PrimeGlyphInfo[] = [];
   const primeGlyphs: string[] = [];
-  let confidence: HejiConfidence = 'exact';
-  let unsupportedPrimeFound = false;
-
-  for (const [prime, exp] of factors.entries()) {
-    if (prime <= 3 || exp === 0) continue;
-    if (!PRIME_ORDER.includes(prime as HejiPrime)) {
-      unsupportedPrimeFound = true;
-      confidence = 'fallback';
-    }
-  }
+  let confidence: HejiConfidence = unsupportedPrimeFound ? 'fallback' : 'exact';
 
   for (const prime of PRIME_ORDER) {
     const exp = factors.get(prime) ?? 0;
@@ -218,15 +232,12 @@ export function getPitchLabelModel(args: {
   }
 
   const residualCents = 1200 * Math.log2(hz / expectedHz);
-  if (unsupportedPrimeFound) {
-    confidence = 'fallback';
-  }
 
   const noteText = `${note.letter}${note.diatonicAccidental}${note.octave}`;
   const hejiAccidentalText = `${diatonicGlyph}${primeGlyphs.join('')}`;
   const centsText = confidence === 'fallback' || Math.abs(residualCents) > 5 ? formatSignedCents(residualCents) : null;
 
-  return {
+  const model: PitchLabelModel = {
     note,
     hz,
     expectedHz,
@@ -237,7 +248,7 @@ export function getPitchLabelModel(args: {
       primeGlyphInfo,
       residualCents,
       confidence,
-      ratioPrimeLimit: getRatioPrimeLimit(factors),
+      ratioPrimeLimit,
       unsupportedPrimeFound,
     },
     display: {
@@ -246,4 +257,7 @@ export function getPitchLabelModel(args: {
       centsText,
     },
   };
+  if (modelCache.size >= MODEL_CACHE_LIMIT) modelCache.clear();
+  modelCache.set(modelCacheKey, model);
+  return model;
 }
@@ -4,7 +4,9 @@ export function gcd(a: number, b: number): number {
   let x = Math.abs(Math.trunc(a));
   let y = Math.abs(Math.trunc(b));
   while (y !== 0) {
-    [x, y] = [y, x % y];
+    const r = x % y;
+    x = y;
+    y = r;
   }
   return x || 1;
 }
@@ -31,6 +33,15 @@ export function factorizeInt(n: number): Map<number, number> {
     return factors;
   }
 
+  if (value < PRIME_TABLE_SIZE) {
+    while (value > 1) {
+      const p = SMALLEST_PRIME_FACTOR[value];
+      factors.set(p, (factors.get(p) ?? 0) + 1);
+      value /= p;
+    }
+    return factors;
+  }
+
   let d = 2;
   while (d * d <= value) {
     while (value % d === 0) {
@@ -47,6 +58,29 @@ export function factorizeInt(n: number): Map<number, number> {
   return factors;
 }
 
+const PRIME_TABLE_SIZE = 257;
+
+// Smallest and largest prime factor of every n < PRIME_TABLE_SIZE, filled once by a sieve.
+// Every prime below 257 fits in a byte, so the tables are compact Uint8Arrays.
+const { SMALLEST_PRIME_FACTOR, MAX_PRIME_FACTOR } = (() => {
+  const smallest = new Uint8Array(PRIME_TABLE_SIZE);
+  const largest = new Uint8Array(PRIME_TABLE_SIZE);
+  for (let p = 2; p < PRIME_TABLE_SIZE; p += 1) {
+    if (largest[p] !== 0) continue;
+    for (let multiple = p; multiple < PRIME_TABLE_SIZE; multiple += p) {
+      if (smallest[multiple] === 0) smallest[multiple] = p;
+      largest[multiple] = p;
+    }
+  }
+  return { SMALLEST_PRIME_FACTOR: smallest, MAX_PRIME_FACTOR: largest };
+})();
+
+export function maxPrimeFactor(n: number): number {
+  const value = Math.abs(Math.trunc(n));
+  if (value < PRIME_TABLE_SIZE) return MAX_PRIME_FACTOR[value];
+  return maxPrimeFactorFromFactorMap(factorizeInt(value));
+}
+
 export function maxPrimeFactorFromFactorMap(
   map: Map<number, number>,
   opts: { ignore?: number[] } = {},
@@ -2,6 +2,7 @@ import {
   factorizeInt,
   gcd,
   isSupportedByHeji2Factors,
+  maxPrimeFactor,
   maxPrimeFactorFromFactorMap,
   reduceFraction,
 } from './primeFactor';
@@ -17,12 +18,17 @@ function mergeFactorMaps(a: Map<number, number>, b: Map<number, number>): Map<nu
   return merged;
 }
 
+function isSupportedFactorMap(merged: Map<number, number>): boolean {
+  return maxPrimeFactorFromFactorMap(merged) <= 31 && isSupportedByHeji2Factors(merged);
+}
+
+function ratioPrimeLimitFromFactorMap(merged: Map<number, number>): number {
+  const limit = maxPrimeFactorFromFactorMap(merged, { ignore: [2, 3] });
+  return limit > 0 ? limit : 3;
+}
+
 export function isSupportedPrimeFactorization(p: number, q: number): boolean {
-  const pFactors = factorizeInt(p);
-  const qFactors = factorizeInt(q);
-  const merged = mergeFactorMaps(pFactors, qFactors);
-  const maxPrime = maxPrimeFactorFromFactorMap(merged);
-  return maxPrime <= 31 && isSupportedByHeji2Factors(merged);
+  return isSupportedFactorMap(mergeFactorMaps(factorizeInt(p), factorizeInt(q)));
 }
 
 export function computeRatioPrimeLimit(frac: string): number {
@@ -31,9 +37,7 @@ export function computeRatioPrimeLimit(frac: string): number {
     return 3;
   }
   const reduced = reduceFraction(pRaw, qRaw);
-  const factors = mergeFactorMaps(factorizeInt(reduced.p), factorizeInt(reduced.q));
-  const limit = maxPrimeFactorFromFactorMap(factors, { ignore: [2, 3] });
-  return limit > 0 ? limit : 3;
+  return ratioPrimeLimitFromFactorMap(mergeFactorMaps(factorizeInt(reduced.p), factorizeInt(reduced.q)));
 }
 
 export function bestSimpleFractionConstrained(x: number, maxDen = 64): {
@@ -53,18 +57,20 @@ export function bestSimpleFractionConstrained(x: number, maxDen = 64): {
   };
 
   for (let q = 1; q <= maxDen; q += 1) {
+    // Every score carries at least 0.08 * q, so larger denominators can no longer win.
+    if (0.08 * q >= best.score) break;
     const p0 = Math.max(1, Math.round(x * q));
-    for (const pTry of [p0 - 1, p0, p0 + 1]) {
+    for (let pTry = p0 - 1; pTry <= p0 + 1; pTry += 1) {
       if (pTry <= 0) continue;
       const reduced = reduceFraction(pTry, q);
-      if (!isSupportedPrimeFactorization(reduced.p, reduced.q)) {
+      // Every prime up to 31 is supported, so the largest prime factor alone decides support and the penalty.
+      const primeLimitPenalty = Math.max(maxPrimeFactor(reduced.p), maxPrimeFactor(reduced.q));
+      if (primeLimitPenalty > 31) {
         continue;
       }
 
       const approx = reduced.p / reduced.q;
       const err = cents(x / approx);
-      const merged = mergeFactorMaps(factorizeInt(reduced.p), factorizeInt(reduced.q));
-      const primeLimitPenalty = maxPrimeFactorFromFactorMap(merged);
       const score = Math.abs(err) + (0.08 * reduced.q) + (0.25 * primeLimitPenalty);
       if (score < best.score) {
         best = { p: reduced.p, q: reduced.q, err, score };
@@ -72,15 +78,16 @@ export function bestSimpleFractionConstrained(x: number, maxDen = 64): {
     }
   }
 
-  const ratioPrimeLimit = computeRatioPrimeLimit(`${best.p}/${best.q}`);
+  // best is already reduced, so factor it once for both the prime limit and the support flag.
+  const merged = mergeFactorMaps(factorizeInt(best.p), factorizeInt(best.q));
   return {
     p: best.p,
     q: best.q,
     frac: `${best.p}/${best.q}`,
     approx: best.p / best.q,
     errCents: best.err,
-    ratioPrimeLimit,
-    ratioSupported: isSupportedPrimeFactorization(best.p, best.q),
+    ratioPrimeLimit: ratioPrimeLimitFromFactorMap(merged),
+    ratioSupported: isSupportedFactorMap(merged),
   };
 }
 
@@ -1,5 +1,6 @@
 import { Link, useParams, useSearchParams } from 'react-router-dom';
 import { useMemo } from 'react';
+import type { PitchGroup } from '../data/types';
 import { useDataset } from '../data/useDataset';
 import { useAudio } from '../audio/AudioContextProvider';
 import { formatHz } from '../lib/format';
@@ -11,12 +12,22 @@ export function BarDetailPage() {
   const tol = (params.get('clusterTol') as '5' | '15' | '30' | null) ?? '15';
   const { bars, pitchIndex, loading, error } = useDataset();
   const { playBar, canPlay } = useAudio();
-  const bar = bars.find((b) => b.barId === barId);
+  // Lookups depend only on the dataset, so Prev/Next navigation between bars reuses them.
+  const barById = useMemo(() => new Map(bars.map((b) => [b.barId, b])), [bars]);
+  const orderIndexById = useMemo(() => new Map((pitchIndex?.allBarsSorted ?? []).map((id, i) => [id, i])), [pitchIndex]);
+  const clusterByBarId = useMemo(() => {
+    const map = new Map<string, PitchGroup>();
+    for (const group of pitchIndex?.clustersByTolerance[tol] ?? []) {
+      for (const member of group.members) if (!map.has(member)) map.set(member, group);
+    }
+    return map;
+  }, [pitchIndex, tol]);
+  const bar = barById.get(barId);
   const order = pitchIndex?.allBarsSorted ?? [];
-  const idx = order.indexOf(barId);
+  const idx = orderIndexById.get(barId) ?? -1;
   const prev = idx > 0 ? order[idx - 1] : null;
   const next = idx >= 0 && idx < order.length - 1 ? order[idx + 1] : null;
-  const cluster = useMemo(() => pitchIndex?.clustersByTolerance[tol].find((g) => g.members.includes(barId)), [barId, pitchIndex, tol]);
+  const cluster = clusterByBarId.get(barId);
   if (loading) return <p>Loading…</p>;
   if (error || !bar || !pitchIndex) return <p>Bar not found</p>;
 
@@ -70,6 +70,10 @@ function formatSignedCents(value: number): string {
   return `${sign}${value.toFixed(2)}c`;
 }
 
+function compareByHz(a: Bar, b: Bar) {
+  return a.hz - b.hz || a.barId.localeCompare(b.barId);
+}
+
 function playOpts(scaleId: string) {
   return scaleId === 'harmonic'
     ? { intervalMs: 240, overlapMs: 0, mode: 'expAccelerando' as const, expFactor: 0.9, minIntervalMs: 45, gain: 0.9 }
@@ -118,7 +122,14 @@ export function InstrumentProfilePage({
 
   const barById = useMemo(() => new Map(bars.map((bar) => [bar.barId, bar])), [bars]);
   const meta = useMemo(() => getInstrumentMeta(instruments, instrumentId ?? ''), [instruments, instrumentId]);
-  const barsForInstrument = useMemo(() => getBarsForInstrument(bars, instrumentId ?? '').sort((a, b) => a.hz - b.hz || a.barId.localeCompare(b.barId)), [bars, instrumentId]);
+  const barsForInstrument = useMemo(() => {
+    const scoped = getBarsForInstrument(bars, instrumentId ?? '');
+    // bars.json is written in (hz, barId) order, so the filtered list is usually sorted already; only sort when it isn't.
+    for (let i = 1; i < scoped.length; i += 1) {
+      if (compareByHz(scoped[i - 1], scoped[i]) > 0) return scoped.sort(compareByHz);
+    }
+    return scoped;
+  }, [bars, instrumentId]);
   const rows = useMemo<PitchRow[]>(() => {
     if (!pitchIndex) return [];
     if (mode === 'all') {
@@ -128,8 +139,12 @@ export function InstrumentProfilePage({
     const clusters = pitchIndex.clustersByTolerance[tolerance] ?? [];
     const scopedRows: PitchRow[] = [];
     for (const cluster of clusters) {
-      const members = cluster.members.map((id) => barById.get(id)).filter((entry): entry is Bar => Boolean(entry));
-      const instrumentMembers = members.filter((entry) => entry.instrumentId === instrumentId);
+      // Resolve and scope members in one pass.
+      const instrumentMembers: Bar[] = [];
+      for (const id of cluster.members) {
+        const entry = barById.get(id);
+        if (entry && entry.instrumentId === instrumentId) instrumentMembers.push(entry);
+      }
       if (!instrumentMembers.length) continue;
       const rep = barById.get(cluster.repBarId) ?? instrumentMembers[0];
       scopedRows.push({ key: `u-${cluster.groupId}`, bar: rep, cluster, members: instrumentMembers, absoluteIndex: scopedRows.length });
@@ -155,18 +155,24 @@ export function PitchListPage() {
 
   const clusters = useMemo(() => (pitchIndex ? pitchIndex.clustersByTolerance[tolerance] : []), [pitchIndex, tolerance]);
 
+  // Lowercase the searchable fields once per bar; the newline keeps matches from spanning two fields.
+  const searchTextById = useMemo(
+    () => new Map(bars.map((bar) => [bar.barId, `${bar.barId}\n${bar.instrumentId}\n${bar.scaleId}`.toLowerCase()])),
+    [bars],
+  );
+  const normalizedQuery = useMemo(() => query.trim().toLowerCase(), [query]);
+
   const filteredBar = (bar?: Bar) => {
     if (!bar) return false;
     if (!selectedScales.has(bar.scaleId)) return false;
-    const q = query.trim().toLowerCase();
-    if (!q) return true;
-    return [bar.barId, bar.instrumentId, bar.scaleId].some((v) => v.toLowerCase().includes(q));
+    if (!normalizedQuery) return true;
+    return (searchTextById.get(bar.barId) ?? '').includes(normalizedQuery);
   };
 
   const allVisible = useMemo(() => {
     if (!pitchIndex) return [] as Bar[];
     return pitchIndex.allBarsSorted.map((id) => barById.get(id)).filter((bar): bar is Bar => filteredBar(bar));
-  }, [pitchIndex, barById, query, selectedScales]);
+  }, [pitchIndex, barById, normalizedQuery, searchTextById, selectedScales]);
 
   const uniqueVisible = useMemo(() => {
     return clusters
@@ -177,7 +183,7 @@ export function PitchListPage() {
         return { cluster, rep, members };
       })
       .filter((item): item is { cluster: PitchGroup; rep: Bar; members: Bar[] } => Boolean(item));
-  }, [clusters, barById, query, selectedScales]);
+  }, [clusters, barById, normalizedQuery, searchTextById, selectedScales]);
 
   const visibleRows = useMemo<PitchRow[]>(() => {
     const rows = mode === 'all'
@@ -186,11 +192,12 @@ export function PitchListPage() {
     return rows;
   }, [allVisible, mode, uniqueVisible]);
 
-  const keyByAnyBarId = useMemo(() => {
-    const map = new Map<string, string>();
-    visibleRows.forEach((row) => {
-      map.set(row.bar.barId, row.key);
-      row.members.forEach((member) => map.set(member.barId, row.key));
+  // Row keys are unique, so any member bar maps straight to its row index.
+  const rowIndexByAnyBarId = useMemo(() => {
+    const map = new Map<string, number>();
+    visibleRows.forEach((row, index) => {
+      map.set(row.bar.barId, index);
+      row.members.forEach((member) => map.set(member.barId, index));
     });
     return map;
   }, [visibleRows]);
@@ -221,6 +228,7 @@ export function PitchListPage() {
   }, [allVisible, mode, uniqueVisible]);
 
   const heroPlayAllBarIds = useMemo(() => uniqueVisible.map((row) => row.rep.barId), [uniqueVisible]);
+  const memberCountByRepId = useMemo(() => new Map(uniqueVisible.map((row) => [row.rep.barId, row.members.length])), [uniqueVisible]);
 
   const padsFilteredByInstrument = useMemo(() => {
     const allowComposite = selectedInstruments.has('composite');
@@ -254,10 +262,8 @@ export function PitchListPage() {
   }, [bars, searchParams]);
 
   const ensureItemVisible = (barId: string) => {
-    const key = keyByAnyBarId.get(barId);
-    if (!key) return;
-    const index = visibleRows.findIndex((row) => row.key === key);
-    if (index < 0) return;
+    const index = rowIndexByAnyBarId.get(barId);
+    if (index === undefined) return;
     paged.setPageIndex(Math.floor(index / Math.max(1, paged.rowsPerPage)));
   };
 
@@ -271,16 +277,14 @@ export function PitchListPage() {
     const clampedStep = Math.min(Math.max(sequence.currentStep, 0), sequence.barIds.length - 1);
     const currentBarId = sequence.barIds[clampedStep];
     if (!currentBarId) return;
-    const key = keyByAnyBarId.get(currentBarId);
-    if (!key) return;
-    const index = visibleRows.findIndex((row) => row.key === key);
-    if (index < 0) return;
+    const index = rowIndexByAnyBarId.get(currentBarId);
+    if (index === undefined) return;
     const targetPage = Math.floor(index / Math.max(1, paged.rowsPerPage));
     if (targetPage !== paged.pageIndex) {
       setPageDirection(targetPage > paged.pageIndex ? 1 : -1);
       paged.setPageIndex(targetPage);
     }
-  }, [followSequence, keyByAnyBarId, paged, sequence.active, sequence.barIds, sequence.currentStep, visibleRows]);
+  }, [followSequence, paged, rowIndexByAnyBarId, sequence.active, sequence.barIds, sequence.currentStep]);
 
   useEffect(() => {
     if (!sequence.active && followSequenceRef.current) {
@@ -642,7 +646,7 @@ export function PitchListPage() {
           <div className="min-h-0 max-h-[min(46vh,420px)] overflow-y-auto overscroll-contain [-webkit-overflow-scrolling:touch]">
             <div className="grid grid-cols-2 gap-2 sm:grid-cols-3 xl:grid-cols-4">
             {padsFilteredByInstrument.map((bar, idx) => {
-              const count = uniqueVisible.find((row) => row.rep.barId === bar.barId)?.members.length ?? 1;
+              const count = memberCountByRepId.get(bar.barId) ?? 1;
               return (
                 <motion.button
                   key={bar.barId}
@@ -34,4 +34,11 @@ export function installNotationFonts(): void {
   `;
 
   document.head.appendChild(style);
+
+  // Faces only download once a glyph needs them; start both now so the first labels don't render with a swap.
+  if ('fonts' in document) {
+    for (const family of ['HEJI2', 'HEJI2Text']) {
+      void document.fonts.load(`16px "${family}"`).catch(() => undefined);
+    }
+  }
 }